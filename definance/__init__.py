@@ -1,5 +1,7 @@
 from . import exceptions
 from .classes import Exchange, PriceData
+from .transport import Transport, RecordingTransport, ReplayTransport, set_transport, get_transport
+from .conversion import fetch_cross_price_data, fetch_cross_rates, is_cross_symbol, update_snapshot
 from .exchange import fetch_binance_price_data, fetch_bitget_price_data, fetch_okx_price_data
 from .symbols import update_symbols, get_binance_coins, get_binance_pairs, get_bitget_coins, \
       get_bitget_pairs, get_okx_coins, get_okx_pairs, get_all_coins, get_all_pairs
@@ -20,6 +22,10 @@ def fetch_price_data(symbol: str, exchange: Exchange = None) -> PriceData:
     - fetch_price_data('BTC/USDT', Exchange.BINANCE)
     """
     if exchange is None:
+        # Pairs that no exchange lists are derived from cached quotes instead of probing every exchange
+        if is_cross_symbol(symbol, get_all_pairs()):
+            return fetch_cross_price_data(symbol)
+
         try:
             price_data = fetch_binance_price_data(symbol)
         except exceptions.SymbolNotFound:
@@ -34,10 +40,16 @@ def fetch_price_data(symbol: str, exchange: Exchange = None) -> PriceData:
         return price_data
     else:
         if exchange == Exchange.BINANCE:
+            if is_cross_symbol(symbol, get_binance_pairs()):
+                return fetch_cross_price_data(symbol, exchange)
             return fetch_binance_price_data(symbol)
         elif exchange == Exchange.BITGET:
+            if is_cross_symbol(symbol, get_bitget_pairs()):
+                return fetch_cross_price_data(symbol, exchange)
             return fetch_bitget_price_data(symbol)
         elif exchange == Exchange.OKX:
+            if is_cross_symbol(symbol, get_okx_pairs()):
+                return fetch_cross_price_data(symbol, exchange)
             return fetch_okx_price_data(symbol)
 
 # This cache symbols from different exchanges
@@ -0,0 +1,447 @@
+import logging
+import threading
+import time
+from typing import Dict, List, Set, Tuple
+
+import requests
+
+from . import symbols as cached_symbols
+from .utils import fetch_api_data, clean_symbol
+from .exceptions import SymbolNotFound
+from .url import get_binance_tickers_api_url, get_bitget_tickers_api_url, get_okx_tickers_api_url
+from .symbols import search_symbol
+from .classes import PriceData, Exchange
+
+
+# Assets allowed in the middle of a conversion path, in order of preference
+BRIDGE_ASSETS: List[str] = ['USDT', 'USDC', 'BTC', 'ETH']
+
+# Snapshots older than this (in seconds) are fetched again
+SNAPSHOT_MAX_AGE: float = 60.0
+
+# Example {Exchange.BINANCE: {'time': 1700000000.0, 'api_url': '...', 'tickers': {'BTC/USDT': {...}}}}
+snapshots: Dict[Exchange, dict] = {}
+
+# Only one thread refreshes the snapshot of an exchange, bulk tickers requests are expensive
+snapshot_locks: Dict[Exchange, threading.Lock] = {exchange: threading.Lock() for exchange in Exchange}
+
+# Example {Exchange.BINANCE: (binance_pairs, {'BTC': {'USDT': 'BTC/USDT'}, 'USDT': {'BTC': 'BTC/USDT'}})}
+pair_graphs: Dict[Exchange, tuple] = {}
+
+EXCHANGE_PAIRS_ATTRIBUTES: Dict[Exchange, str] = {
+    Exchange.BINANCE: 'binance_pairs',
+    Exchange.BITGET: 'bitget_pairs',
+    Exchange.OKX: 'okx_pairs',
+}
+
+
+def fetch_cross_price_data(symbol: str, exchange: Exchange = None, max_age: float = SNAPSHOT_MAX_AGE) -> PriceData:
+    '''
+    Derive the price data of a pair that is not listed directly, by chaining listed pairs through
+    common quotes (USDT, USDC, BTC, ETH). The legs come from bulk ticker snapshots, so no request is
+    sent per pair. The most liquid path of all the exchanges tried is used.
+
+    Args:
+    - symbol (str): The symbol of the pair. Example: 'SOL/EUR', 'DOGE/ETH'.
+    - exchange (Exchange): The exchange to use the pairs of. If None, then the function will compare all exchanges.
+    - max_age (float): The maximum age in seconds of a cached snapshot before it is fetched again.
+
+    Returns:
+    - PriceData: The derived price data. Volume is expressed in the base asset and limited by the least liquid leg.
+      High and low prices are bounds built from the 24h high and low of every leg, not the real 24h high and low of the pair.
+
+    Example:
+    - fetch_cross_price_data('SOL/EUR', Exchange.BINANCE)
+    '''
+
+    base_asset, quote_asset = split_cross_symbol(symbol)
+
+    exchanges = [exchange] if exchange is not None else [Exchange.BINANCE, Exchange.BITGET, Exchange.OKX]
+    best_price_data = None
+    transport_error = None
+
+    for current_exchange in exchanges:
+        paths = find_conversion_paths(base_asset, quote_asset, get_pair_graph(current_exchange))
+
+        # Don't fetch a snapshot if the exchange can't convert the pair anyway
+        if len(paths) == 0:
+            continue
+
+        # One exchange failing (5xx, timeout) shouldn't prevent the others from deriving the pair
+        try:
+            snapshot = get_snapshot(current_exchange, max_age)
+        except requests.RequestException as error:
+            logging.error(f"Failed to update {current_exchange.value} snapshot: {error}")
+            transport_error = error
+            continue
+
+        if snapshot is None:
+            continue
+
+        price_data = compute_cross_price_data(base_asset, quote_asset, paths, snapshot, current_exchange)
+
+        # Volumes are all in the base asset, so they can be compared between exchanges
+        if price_data is not None and (best_price_data is None or price_data.volume > best_price_data.volume):
+            best_price_data = price_data
+
+    if best_price_data is None:
+        # Report the failure instead of SymbolNotFound, the pair may exist on the exchange that failed
+        if transport_error is not None:
+            raise transport_error
+
+        raise SymbolNotFound(f'Symbol {symbol} can not be derived from any exchange')
+
+    return best_price_data
+
+
+def fetch_cross_rates(symbols: List[str], exchange: Exchange = None, max_age: float = SNAPSHOT_MAX_AGE) -> Dict[str, PriceData]:
+    '''
+    Derive the price data of many pairs at once. Snapshots are shared between all pairs,
+    so the whole list costs at most one request per exchange.
+
+    Args:
+    - symbols (List[str]): The symbols of the pairs. Example: ['SOL/EUR', 'DOGE/ETH'].
+    - exchange (Exchange): The exchange to use the pairs of. If None, then the function will try all exchanges.
+    - max_age (float): The maximum age in seconds of a cached snapshot before it is fetched again.
+
+    Returns:
+    - Dict[str, PriceData]: The derived price data by symbol. Symbols that can't be derived are left out.
+    '''
+
+    cross_rates: Dict[str, PriceData] = {}
+
+    for symbol in symbols:
+        try:
+            cross_rates[symbol] = fetch_cross_price_data(symbol, exchange, max_age)
+        except SymbolNotFound:
+            continue
+
+    return cross_rates
+
+
+def is_cross_symbol(symbol: str, pairs: List[str]) -> bool:
+    '''
+    Return True if the symbol is a pair that is not listed in pairs, but whose base and quote
+    assets are both traded in pairs. Symbols without separator like SOLEUR are split with the assets of pairs.
+    '''
+
+    symbol = clean_symbol(symbol)
+
+    if search_symbol(symbol, pairs):
+        return False
+
+    assets = {asset for pair in pairs for asset in pair.split('/')}
+
+    if '/' not in symbol:
+        # A single coin like BTC is not a pair
+        if symbol in assets:
+            return False
+
+        symbol = split_unseparated_symbol(symbol, assets)
+
+        if symbol is None:
+            return False
+
+    if symbol.count('/') != 1:
+        return False
+
+    base_asset, quote_asset = symbol.split('/')
+
+    # A pair of the same asset like BTC/BTC can't be derived
+    if base_asset == quote_asset:
+        return False
+
+    return base_asset in assets and quote_asset in assets
+
+
+def split_cross_symbol(symbol: str) -> Tuple[str, str]:
+    cleaned_symbol = clean_symbol(symbol)
+
+    if '/' not in cleaned_symbol:
+        assets = set()
+
+        for exchange in EXCHANGE_PAIRS_ATTRIBUTES:
+            assets.update(get_pair_graph(exchange))
+
+        cleaned_symbol = split_unseparated_symbol(cleaned_symbol, assets) or cleaned_symbol
+
+    parts = cleaned_symbol.split('/')
+
+    if len(parts) != 2 or not parts[0] or not parts[1]:
+        raise SymbolNotFound(f'Symbol {symbol} must have the format BASE/QUOTE to be derived')
+
+    if parts[0] == parts[1]:
+        raise SymbolNotFound(f'Symbol {symbol} must have different base and quote assets to be derived')
+
+    return parts[0], parts[1]
+
+
+def split_unseparated_symbol(symbol: str, assets: Set[str]) -> str | None:
+    '''
+    Split a symbol without separator into BASE/QUOTE, where both are known assets.
+    Longer quotes are tried first, so XUSDT is split as X/USDT rather than XUSD/T.
+
+    Example:
+    - split_unseparated_symbol('SOLEUR', {'SOL', 'EUR', 'USDT'}) -> 'SOL/EUR'
+    '''
+
+    for index in range(1, len(symbol)):
+        base_asset, quote_asset = symbol[:index], symbol[index:]
+
+        if base_asset in assets and quote_asset in assets:
+            return f'{base_asset}/{quote_asset}'
+
+    return None
+
+
+def get_pair_graph(exchange: Exchange) -> Dict[str, Dict[str, str]]:
+    '''
+    Return the graph of the cached pairs of the exchange, where every asset points to the
+    assets it is traded against and the pair used for it.
+    The graph is built again only when the cached pairs are updated.
+    '''
+
+    pairs = getattr(cached_symbols, EXCHANGE_PAIRS_ATTRIBUTES[exchange])
+
+    if exchange in pair_graphs and pair_graphs[exchange][0] is pairs:
+        return pair_graphs[exchange][1]
+
+    graph: Dict[str, Dict[str, str]] = {}
+
+    for pair in pairs:
+        base_asset, quote_asset = pair.split('/')
+        graph.setdefault(base_asset, {})[quote_asset] = pair
+        graph.setdefault(quote_asset, {})[base_asset] = pair
+
+    pair_graphs[exchange] = (pairs, graph)
+
+    return graph
+
+
+def find_conversion_paths(base_asset: str, quote_asset: str, graph: Dict[str, Dict[str, str]], max_hops: int = 3) -> List[List[str]]:
+    '''
+    Find the shortest conversion paths from base_asset to quote_asset, only going through BRIDGE_ASSETS.
+
+    Returns:
+    - List[List[str]]: The paths as lists of assets, in order of bridge preference.
+
+    Example:
+    - find_conversion_paths('SOL', 'EUR', graph) -> [['SOL', 'USDT', 'EUR'], ['SOL', 'BTC', 'EUR']]
+    '''
+
+    if base_asset not in graph or quote_asset not in graph:
+        return []
+
+    paths = [[base_asset]]
+
+    for _ in range(max_hops):
+        found_paths = [path + [quote_asset] for path in paths if quote_asset in graph[path[-1]]]
+
+        if len(found_paths) != 0:
+            return found_paths
+
+        paths = [
+            path + [bridge_asset]
+            for path in paths
+            for bridge_asset in BRIDGE_ASSETS
+            if bridge_asset not in path and bridge_asset != quote_asset and bridge_asset in graph[path[-1]]
+        ]
+
+    return []
+
+
+def compute_cross_price_data(base_asset: str, quote_asset: str, paths: List[List[str]], snapshot: dict, exchange: Exchange) -> PriceData | None:
+    '''
+    Compute the price data of every path from the snapshot and return the most liquid one,
+    or None if no path has all its legs in the snapshot.
+    '''
+
+    graph = get_pair_graph(exchange)
+    best_legs = None
+
+    for path in paths:
+        legs = compute_path_legs(path, graph, snapshot['tickers'])
+
+        if legs is not None and (best_legs is None or legs['volume'] > best_legs['volume']):
+            best_legs = legs
+
+    if best_legs is None:
+        return None
+
+    return PriceData(
+        symbol=f'{base_asset}/{quote_asset}',
+        current_price=best_legs['current_price'],
+        volume=best_legs['volume'],
+        high_price=best_legs['high_price'],
+        low_price=best_legs['low_price'],
+        change=(best_legs['change_factor'] - 1) * 100,
+        api_url=snapshot['api_url'],
+        exchange=exchange
+    )
+
+
+def compute_path_legs(path: List[str], graph: Dict[str, Dict[str, str]], tickers: Dict[str, dict]) -> dict | None:
+    # Everything is accumulated as "quote per base", walking the path one leg at a time.
+    # Legs don't reach their high and low at the same time, so high and low are only bounds
+    current_price, high_price, low_price, change_factor = 1.0, 1.0, 1.0, 1.0
+    volume = None
+
+    for from_asset, to_asset in zip(path, path[1:]):
+        pair = graph[from_asset][to_asset]
+        ticker = tickers.get(pair)
+
+        if ticker is None or min(ticker['current_price'], ticker['high_price'], ticker['low_price']) <= 0:
+            return None
+
+        # Ticker volume is in the base asset of the pair, convert it to the base asset of the path
+        if pair.split('/')[0] == from_asset:
+            leg_volume = ticker['volume'] / current_price
+            current_price *= ticker['current_price']
+            high_price *= ticker['high_price']
+            low_price *= ticker['low_price']
+            change_factor *= 1 + ticker['change'] / 100
+        else:
+            # The pair is listed the other way around, so the leg is inverted
+            current_price /= ticker['current_price']
+            leg_volume = ticker['volume'] / current_price
+            high_price /= ticker['low_price']
+            low_price /= ticker['high_price']
+            change_factor /= 1 + ticker['change'] / 100
+
+        volume = leg_volume if volume is None else min(volume, leg_volume)
+
+    return {
+        'current_price': current_price,
+        'volume': volume,
+        'high_price': high_price,
+        'low_price': low_price,
+        'change_factor': change_factor,
+    }
+
+
+def get_snapshot(exchange: Exchange, max_age: float = SNAPSHOT_MAX_AGE) -> dict | None:
+    '''
+    Return the cached tickers snapshot of the exchange, fetching it again if it is older than max_age.
+    Return None if the snapshot had to be fetched and the exchange didn't return any data.
+    '''
+
+    snapshot = snapshots.get(exchange)
+
+    if snapshot is not None and time.time() - snapshot['time'] <= max_age:
+        return snapshot
+
+    with snapshot_locks[exchange]:
+        # Another thread may have refreshed the snapshot while we were waiting for the lock
+        snapshot = snapshots.get(exchange)
+
+        if snapshot is None or time.time() - snapshot['time'] > max_age:
+            snapshot = update_snapshot(exchange)
+
+    return snapshot
+
+
+def update_snapshot(exchange: Exchange) -> dict | None:
+    '''
+    Fetch the tickers of all spot pairs of the exchange with a single request and cache them.
+
+    Args:
+    - exchange (Exchange): The exchange to fetch the tickers from.
+
+    Returns:
+    - dict | None: The snapshot, with the tickers by pair, or None if the exchange didn't return any data.
+      Example: {'time': ..., 'api_url': ..., 'tickers': {'BTC/USDT': {...}}}
+    '''
+
+    if exchange == Exchange.BINANCE:
+        api_url = get_binance_tickers_api_url()
+    elif exchange == Exchange.BITGET:
+        api_url = get_bitget_tickers_api_url()
+    elif exchange == Exchange.OKX:
+        api_url = get_okx_tickers_api_url()
+    else:
+        raise ValueError(f'Invalid exchange: {exchange}')
+
+    data = fetch_api_data(api_url)
+
+    # Keep the previous snapshot if the exchange didn't answer (for example 429), so the next call retries
+    if data is None:
+        return None
+
+    if exchange == Exchange.BINANCE:
+        tickers = parse_binance_tickers(data)
+    elif exchange == Exchange.BITGET:
+        tickers = parse_bitget_tickers(data['data'])
+    else:
+        tickers = parse_okx_tickers(data['data'])
+
+    snapshot = {'time': time.time(), 'api_url': api_url, 'tickers': tickers}
+    snapshots[exchange] = snapshot
+
+    return snapshot
+
+
+def parse_binance_tickers(data: list) -> Dict[str, dict]:
+    # Binance symbols have no separator, so map them back with the cached pairs
+    pairs = {pair.replace('/', ''): pair for pair in cached_symbols.get_binance_pairs()}
+    tickers: Dict[str, dict] = {}
+
+    for ticker in data:
+        pair = pairs.get(ticker['symbol'])
+
+        if pair is None:
+            continue
+
+        tickers[pair] = {
+            'current_price': float(ticker['lastPrice']),
+            'volume': float(ticker['volume']),
+            'high_price': float(ticker['highPrice']),
+            'low_price': float(ticker['lowPrice']),
+            'change': float(ticker['priceChangePercent']),
+        }
+
+    return tickers
+
+
+def parse_bitget_tickers(data: list) -> Dict[str, dict]:
+    # Bitget symbols have no separator, so map them back with the cached pairs
+    pairs = {pair.replace('/', ''): pair for pair in cached_symbols.get_bitget_pairs()}
+    tickers: Dict[str, dict] = {}
+
+    for ticker in data:
+        pair = pairs.get(ticker['symbol'])
+
+        if pair is None:
+            continue
+
+        # Bitget provide 24h change between 0 and 1, so we multiply it by 100 to get percentage
+        tickers[pair] = {
+            'current_price': float(ticker['lastPr']),
+            'volume': float(ticker['baseVolume']),
+            'high_price': float(ticker['high24h']),
+            'low_price': float(ticker['low24h']),
+            'change': float(ticker['change24h']) * 100,
+        }
+
+    return tickers
+
+
+def parse_okx_tickers(data: list) -> Dict[str, dict]:
+    tickers: Dict[str, dict] = {}
+
+    for ticker in data:
+        # OKX uses '-' in all pairs to separate base and quote assets
+        pair = ticker['instId'].replace('-', '/')
+        open_price = float(ticker['sodUtc0'] or 0)
+
+        # OKX doesn't provide 24h change, so we calculate it
+        change = (float(ticker['last']) / open_price) * 100 - 100 if open_price > 0 else 0.0
+
+        tickers[pair] = {
+            'current_price': float(ticker['last']),
+            'volume': float(ticker['vol24h']),
+            'high_price': float(ticker['high24h']),
+            'low_price': float(ticker['low24h']),
+            'change': change,
+        }
+
+    return tickers
@@ -117,6 +117,10 @@ def fetch_okx_price_data(symbol: str) -> PriceData:
 
     for api_url in api_links:
         price_data = fetch_api_data(api_url)
+
+        if price_data is None:
+            continue
+
         if len(price_data['data']) != 0:
 
             price_data = price_data['data'][0]
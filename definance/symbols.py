@@ -1,8 +1,8 @@
-import requests
 from typing import Set, List
 import logging
 
 from .url import get_binance_info_url, get_okx_info_url, get_bitget_info_url
+from .transport import get_transport
 
 
 # Example {'BTC', 'ETH', 'BNB'}
@@ -39,7 +39,7 @@ def update_binance_symbols():
         update_binance_coins: Set[str] = set()
         updated_binance_pairs: Set[str] = set()
 
-        response = requests.get(get_binance_info_url())
+        response = get_transport().get(get_binance_info_url())
         response.raise_for_status()
         data = response.json()
 
@@ -66,7 +66,7 @@ def update_bitget_symbols():
         updated_bitget_coins: Set[str] = set()
         updated_bitget_pairs: Set[str] = set()
 
-        response = requests.get(get_bitget_info_url())
+        response = get_transport().get(get_bitget_info_url())
         response.raise_for_status()
         data = response.json()
 
@@ -93,7 +93,7 @@ def update_okx_symbols():
         updated_okx_coins: Set[str] = set()
         updated_okx_pairs: Set[str] = set()
 
-        response = requests.get(get_okx_info_url())
+        response = get_transport().get(get_okx_info_url())
         response.raise_for_status()
         data = response.json()
 
@@ -0,0 +1,195 @@
+import gzip
+import json
+import os
+import random
+import threading
+import time
+from typing import Dict, List
+
+import requests
+
+
+class TransportResponse:
+    '''
+    Minimal HTTP response returned by the record and replay transports.
+    It mirrors the parts of requests.Response used by definance.
+    '''
+
+    def __init__(self, url: str, status_code: int, text: str):
+        '''
+        Initialize the TransportResponse object
+
+        Args:
+        - url (str): The URL of the request
+        - status_code (int): The HTTP status code
+        - text (str): The raw response body
+
+        Returns:
+        - None
+        '''
+
+        self.url = str(url)
+        self.status_code = int(status_code)
+        self.text = str(text)
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f'{self.status_code} Error for url: {self.url}', response=self)
+
+
+class Transport:
+    '''
+    Default transport, it sends the requests to the real exchanges.
+    '''
+
+    def get(self, url: str):
+        return requests.get(url)
+
+
+class RecordingTransport(Transport):
+    '''
+    Transport that forwards the requests to another transport and records every response,
+    so they can be saved to an archive and replayed later with ReplayTransport.
+    '''
+
+    def __init__(self, path: str, transport: Transport = None):
+        '''
+        Initialize the RecordingTransport object
+
+        Args:
+        - path (str): The path of the archive to save the responses to
+        - transport (Transport): The transport to forward the requests to. If None, then the real exchanges are used.
+
+        Returns:
+        - None
+        '''
+
+        self.path = path
+        self.transport = transport or Transport()
+        self.records: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str):
+        response = self.transport.get(url)
+
+        with self._lock:
+            self.records[url] = {'status_code': response.status_code, 'text': response.text}
+
+        return response
+
+    def save(self):
+        '''
+        Save the recorded responses to the archive (gzip compressed JSON).
+        '''
+
+        with self._lock:
+            records = dict(self.records)
+
+        save_archive(self.path, records)
+
+
+class ReplayTransport(Transport):
+    '''
+    Transport that serves the responses of an archive without touching the network.
+    Latency, jitter and errors can be injected to simulate real exchanges.
+    '''
+
+    def __init__(self,
+                 path: str,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 error_status_codes: List[int] = None,
+                 timeout_rate: float = 0.0,
+                 seed: int = None):
+        '''
+        Initialize the ReplayTransport object
+
+        Args:
+        - path (str): The path of the archive recorded with RecordingTransport
+        - latency (float): The delay in seconds added to every response
+        - jitter (float): The maximum random delay in seconds added on top of the latency
+        - error_rate (float): The probability between 0 and 1 to answer with an error status code
+        - error_status_codes (List[int]): The status codes to pick from when injecting an error. Default: [404, 429, 500, 502, 503]
+        - timeout_rate (float): The probability between 0 and 1 to raise requests.Timeout
+        - seed (int): The seed of the random generator, to make the error injection reproducible
+
+        Returns:
+        - None
+        '''
+
+        self.records = load_archive(path)
+        self.latency = float(latency)
+        self.jitter = float(jitter)
+        self.error_rate = float(error_rate)
+        self.error_status_codes = error_status_codes or [404, 429, 500, 502, 503]
+        self.timeout_rate = float(timeout_rate)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get(self, url: str):
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+            timeout = self._random.random() < self.timeout_rate
+            error = self._random.random() < self.error_rate
+            error_status_code = self._random.choice(self.error_status_codes)
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if timeout:
+            raise requests.Timeout(f'Injected timeout for url: {url}')
+
+        if error:
+            return TransportResponse(url, error_status_code, '')
+
+        record = self.records.get(url)
+
+        # URLs missing from the archive are treated as not found, like an unknown symbol
+        if record is None:
+            return TransportResponse(url, 404, '')
+
+        return TransportResponse(url, record['status_code'], record['text'])
+
+
+def save_archive(path: str, records: Dict[str, dict]):
+    with gzip.open(path, 'wt', encoding='utf-8') as file:
+        json.dump(records, file, separators=(',', ':'))
+
+
+def load_archive(path: str) -> Dict[str, dict]:
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        return json.load(file)
+
+
+# Set DEFINANCE_REPLAY_ARCHIVE before importing definance to replay the archive from the start,
+# so the symbols cached at import time don't hit the real exchanges either
+REPLAY_ARCHIVE_ENV: str = 'DEFINANCE_REPLAY_ARCHIVE'
+
+transport: Transport = ReplayTransport(os.environ[REPLAY_ARCHIVE_ENV]) if os.environ.get(REPLAY_ARCHIVE_ENV) else Transport()
+
+
+def set_transport(new_transport: Transport):
+    '''
+    Set the transport used by definance to send all requests.
+
+    Args:
+    - new_transport (Transport): The transport to use. If None, then the real exchanges are used.
+
+    Example:
+    - set_transport(ReplayTransport('binance.json.gz', latency=0.05, error_rate=0.01))
+    '''
+    global transport
+
+    transport = new_transport or Transport()
+
+
+def get_transport() -> Transport:
+    '''
+    Return the transport used by definance to send all requests.
+    '''
+
+    return transport
@@ -11,6 +11,10 @@ def get_binance_price_api_url(symbol: str) -> str:
     return f"https://api.binance.com/api/v3/ticker/24hr?symbol={symbol}"
 
 
+def get_binance_tickers_api_url() -> str:
+    return "https://api.binance.com/api/v3/ticker/24hr"
+
+
 # Bitget
 
 def get_bitget_info_url() -> str:
@@ -22,6 +26,10 @@ def get_bitget_price_api_url(symbol: str) -> str:
     return f"https://api.bitget.com/api/v2/spot/market/tickers?symbol={symbol}"
 
 
+def get_bitget_tickers_api_url() -> str:
+    return "https://api.bitget.com/api/v2/spot/market/tickers"
+
+
 # OKX
 
 def get_okx_info_url() -> str:
@@ -30,3 +38,7 @@ def get_okx_info_url() -> str:
 def get_okx_price_api_url(symbol: str) -> str:
     symbol = symbol.replace('/', '-').upper()
     return f"https://www.okx.com/api/v5/market/ticker?instId={symbol}"
+
+def get_okx_tickers_api_url() -> str:
+    return "https://www.okx.com/api/v5/market/tickers?instType=SPOT"
+
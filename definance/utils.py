@@ -1,12 +1,11 @@
 
-import requests
-
 from .classes import Exchange
 from .symbols import get_binance_pairs, get_bitget_pairs
+from .transport import get_transport
 
 
 def fetch_api_data(api_link: str):    
-    response = requests.get(api_link)
+    response = get_transport().get(api_link)
 
     if response.status_code >= 400 and response.status_code < 500:
         # Data not found
@@ -55,6 +54,10 @@ def break_full_symbol(symbol: str, exchange: Exchange) -> tuple[str, str]:
     - break_full_symbol('BTCUSDT', Exchange.BINANCE) -> ('BTC', 'USDT')
     """
 
+    # Symbols like SOL/EUR are already separated, for example derived cross rates
+    if symbol.count('/') == 1:
+        return symbol.split('/')[0], symbol.split('/')[1]
+
     if exchange == Exchange.BINANCE:
         pairs = get_binance_pairs()
     elif exchange == Exchange.BITGET: